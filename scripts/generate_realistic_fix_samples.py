@@ -18,23 +18,78 @@ from __future__ import annotations
 
 import argparse
 import csv
-import io
+import functools
+import http.client
 import json
+import os
 import random
 import re
+import string
 import sys
+import threading
 import time as time_module
+import urllib.parse
 import urllib.request
 import xml.etree.ElementTree as ET
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from dataclasses import dataclass, field
-from datetime import UTC, date, datetime, time, timedelta
+from datetime import UTC, date, datetime, timedelta
 from pathlib import Path
+from typing import TextIO
 from urllib.error import URLError
 
+try:
+    import orjson
+except ImportError:  # optional accelerator, the standard library json module is used without it
+    orjson = None
+
 UA = "FixDecoderSampleBot/1.0 (contact: github@kybelksties.com)"
+REQUEST_HEADERS = {"User-Agent": UA, "Accept": "application/json,text/plain,*/*"}
+REDIRECT_STATUSES = {301, 302, 303, 307, 308}
+OUTPUT_BUFFER_SIZE = 1 << 20
+PARALLEL_MIN_MESSAGES = 100
+
+MEDIUM_PAYLOAD = "ALERT-" + ("ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789" * 12)
+VERY_LONG_PAYLOAD = "RISK-" + ("ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789" * 110)
+
+MSG_BASE_DATE = date(2026, 2, 19)
+MSG_BASE_DAY = f"{MSG_BASE_DATE:%Y%m%d}"
+MSG_BASE_SECONDS = 12 * 3600
+
+PARTY_ROLES = ("1", "3", "12", "24")
+SIDES = ("1", "2")
+SECURITY_TYPES = ("CS", "FOR", "TBOND", "FUT", "REPO")
+BOOLEAN_VALUES = ("Y", "N")
+CHAR_VALUES = ("A", "B", "C", "D", "1", "2")
+
+# Quantities and prices cycle with the message index, so each distinct string is formatted once up front.
+ORDER_QTYS = tuple(str(100 + k * 25) for k in range(25))
+ORDER_PRICES = tuple(f"{20 + k * 1.37:.2f}" for k in range(70))
+FIELD_QTYS = tuple(str(50 + k * 10) for k in range(30))
+FIELD_PRICES = tuple(f"{80 + k * 0.77:.2f}" for k in range(50))
+
+NON_ALNUM_RE = re.compile(r"[^A-Z0-9]")
+# Deletes every Latin-1 character other than A-Z and 0-9; str.translate does this in one C-level pass.
+NON_ALNUM_TABLE = {i: None for i in range(256) if chr(i) not in string.ascii_uppercase + string.digits}
+BANK_NAME_RE = re.compile(r"\b(BANK|BANCORP|FINANCIAL|TRUST|HOLDINGS)\b", re.IGNORECASE)
+FUND_NAME_RE = re.compile(r"\b(FUND|CAPITAL|ASSET|ADVIS|MANAGEMENT|PARTNERS)\b", re.IGNORECASE)
+NON_COMPANY_NAME_RE = re.compile(r"\b(FUND|CAPITAL|ASSET|ADVIS|MANAGEMENT|BANK|BANCORP|TRUST)\b", re.IGNORECASE)
+
+REFERENCE_URLS = {
+    "nasdaq_listed": "https://www.nasdaqtrader.com/dynamic/SymDir/nasdaqlisted.txt",
+    "nasdaq_other": "https://www.nasdaqtrader.com/dynamic/SymDir/otherlisted.txt",
+    "ecb_fx": "https://www.ecb.europa.eu/stats/eurofxref/eurofxref-hist.csv",
+    "us_treasury": (
+        "https://api.fiscaldata.treasury.gov/services/api/fiscal_service/v1/debt/mspd/mspd_table_5"
+        "?filter=record_date:gte:2025-01-01&sort=-record_date&page%5Bsize%5D=60"
+    ),
+    "nyfed_rates": "https://markets.newyorkfed.org/api/rates/all/latest.json",
+    "cftc_fin_fut": "https://www.cftc.gov/dea/newcot/FinFutWk.txt",
+}
 
 
-@dataclass
+@dataclass(slots=True)
 class Member:
     kind: str
     name: str
@@ -42,18 +97,43 @@ class Member:
     children: list["Member"] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
+class MessageMeta:
+    """Dictionary-derived facts about one MsgType that message generation needs for every instance."""
+
+    members: list[Member]
+    groups: tuple[Member, ...]
+    direct_groups: tuple[Member, ...]
+    required_names: tuple[str, ...]
+    required_tags: tuple[str, ...]
+    group_tags: dict[str, str]
+
+
+@dataclass(slots=True)
 class DictionaryModel:
     field_numbers: dict[str, int]
     field_types: dict[str, str]
     messages: dict[str, list[Member]]
     components: dict[str, list[Member]]
+    # Lazily filled lookups; the dictionary itself never changes after loading.
+    first_tag_cache: dict[tuple[str, str], int | None] = field(default_factory=dict, repr=False, compare=False)
+    message_meta_cache: dict[str, MessageMeta] = field(default_factory=dict, repr=False, compare=False)
 
 
 def warn(msg: str) -> None:
     print(f"[warn] {msg}", file=sys.stderr)
 
 
+def json_loads(text: str | bytes):
+    return orjson.loads(text) if orjson is not None else json.loads(text)
+
+
+def json_dumps_indented(obj) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2).encode("utf-8")
+
+
 def default_reference_data() -> dict:
     return {
         "equities": [
@@ -87,14 +167,71 @@ def default_reference_data() -> dict:
     }
 
 
+_connections = threading.local()
+
+
+def pooled_connection(scheme: str, host: str, timeout: int) -> http.client.HTTPConnection:
+    """Return this thread's keep-alive connection to scheme://host, opening it on first use."""
+    pool: dict[tuple[str, str], http.client.HTTPConnection] = _connections.__dict__.setdefault("pool", {})
+    conn = pool.get((scheme, host))
+    if conn is None:
+        conn_cls = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+        conn = conn_cls(host, timeout=timeout)
+        pool[(scheme, host)] = conn
+    return conn
+
+
+def drop_connection(scheme: str, host: str) -> None:
+    conn = _connections.__dict__.get("pool", {}).pop((scheme, host), None)
+    if conn is not None:
+        conn.close()
+
+
+def close_connections() -> None:
+    for conn in _connections.__dict__.pop("pool", {}).values():
+        conn.close()
+
+
+def http_get(url: str, timeout: int, max_redirects: int = 5) -> str:
+    for _ in range(max_redirects + 1):
+        parts = urllib.parse.urlsplit(url)
+        path = parts.path or "/"
+        if parts.query:
+            path += "?" + parts.query
+        conn = pooled_connection(parts.scheme, parts.netloc, timeout)
+        try:
+            conn.request("GET", path, headers=REQUEST_HEADERS)
+            resp = conn.getresponse()
+            body = resp.read()
+        except (OSError, http.client.HTTPException):
+            drop_connection(parts.scheme, parts.netloc)
+            raise
+        if resp.will_close:
+            drop_connection(parts.scheme, parts.netloc)
+        location = resp.getheader("Location")
+        if resp.status in REDIRECT_STATUSES and location:
+            url = urllib.parse.urljoin(url, location)
+            continue
+        if resp.status >= 400:
+            raise URLError(f"HTTP {resp.status} {resp.reason}")
+        return body.decode("utf-8", errors="replace")
+    raise URLError(f"Too many redirects for {url}")
+
+
+def urlopen_text(url: str, timeout: int) -> str:
+    req = urllib.request.Request(url, headers=REQUEST_HEADERS)
+    with urllib.request.urlopen(req, timeout=timeout) as resp:
+        return resp.read().decode("utf-8", errors="replace")
+
+
 def fetch_text(url: str, timeout: int = 40, retries: int = 3) -> str:
-    req = urllib.request.Request(url, headers={"User-Agent": UA, "Accept": "application/json,text/plain,*/*"})
+    # Reuse keep-alive connections unless a proxy is configured, which only urllib knows how to use.
+    get = urlopen_text if urllib.request.getproxies() else http_get
     last_error: Exception | None = None
     for attempt in range(1, retries + 1):
         try:
-            with urllib.request.urlopen(req, timeout=timeout) as resp:
-                return resp.read().decode("utf-8", errors="replace")
-        except (TimeoutError, URLError, OSError) as exc:
+            return get(url, timeout)
+        except (TimeoutError, URLError, OSError, http.client.HTTPException) as exc:
             last_error = exc
             if attempt < retries:
                 sleep_s = 1.5 * attempt
@@ -103,118 +240,228 @@ def fetch_text(url: str, timeout: int = 40, retries: int = 3) -> str:
     raise RuntimeError(f"Failed to fetch {url} after {retries} attempts: {last_error}")
 
 
+def fetch_same_host(urls: list[tuple[str, str]]) -> dict[str, str | Exception]:
+    results: dict[str, str | Exception] = {}
+    try:
+        for key, url in urls:
+            try:
+                results[key] = fetch_text(url)
+            except Exception as exc:
+                results[key] = exc
+    finally:
+        close_connections()
+    return results
+
+
+def fetch_all(urls: dict[str, str]) -> dict[str, str | Exception]:
+    """
+    Fetch all URLs, one worker thread per host; a failed fetch maps to its exception instead of the body.
+
+    URLs sharing a host are fetched back to back on the same worker so they reuse one keep-alive connection.
+    """
+    by_host: dict[str, list[tuple[str, str]]] = {}
+    for key, url in urls.items():
+        by_host.setdefault(urllib.parse.urlsplit(url).netloc, []).append((key, url))
+    results: dict[str, str | Exception] = {}
+    with ThreadPoolExecutor(max_workers=max(1, len(by_host))) as pool:
+        for host_results in pool.map(fetch_same_host, by_host.values()):
+            results.update(host_results)
+    return results
+
+
+def fetched_body(bodies: dict[str, str | Exception], key: str) -> str:
+    body = bodies[key]
+    if isinstance(body, Exception):
+        raise body
+    return body
+
+
 def parse_fix_line(line: str) -> list[tuple[str, str]]:
     out: list[tuple[str, str]] = []
-    for token in line.strip().split("|"):
+    for token in line.split("|"):
         if not token or "=" not in token:
             continue
         k, v = token.split("=", 1)
-        out.append((k, v))
+        # Tags come from a small set; interning lets dict lookups on them hit the identity fast path.
+        out.append((sys.intern(k), v))
     return out
 
 
-def render_fix_line(fields: list[tuple[str, str]]) -> str:
-    return "".join(f"{k}={v}|" for k, v in fields)
+def render_fix_line(fields: list[tuple[str, str]] | OrderedFields) -> str:
+    if not fields:
+        return ""
+    # Plain concatenation and one join avoid an f-string format call per field.
+    return "|".join([k + "=" + v for k, v in fields]) + "|"
+
+
+class OrderedFields:
+    """
+    Ordered FIX tag/value pairs with an index of the first position of each tag.
+
+    Tags may repeat (repeating groups); lookups and updates act on the first occurrence, as FIX readers do.
+    """
 
+    def __init__(self, fields: list[tuple[str, str]]) -> None:
+        self._fields = list(fields)
+        self._first: dict[str, int] = {}
+        self._reindex()
 
-def set_or_add(fields: list[tuple[str, str]], tag: str, value: str) -> None:
-    for i, (k, _) in enumerate(fields):
-        if k == tag:
-            fields[i] = (tag, value)
-            return
-    fields.append((tag, value))
+    def _reindex(self) -> None:
+        self._first.clear()
+        for i, (k, _) in enumerate(self._fields):
+            self._first.setdefault(k, i)
 
+    def copy(self) -> OrderedFields:
+        clone = OrderedFields.__new__(OrderedFields)
+        clone._fields = self._fields.copy()
+        clone._first = self._first.copy()
+        return clone
 
-def has_tag(fields: list[tuple[str, str]], tag: str) -> bool:
-    return any(k == tag for k, _ in fields)
+    def __iter__(self) -> Iterator[tuple[str, str]]:
+        return iter(self._fields)
 
+    def __len__(self) -> int:
+        return len(self._fields)
 
-def remove_first_tag(fields: list[tuple[str, str]], tag: str) -> bool:
-    for i, (k, _) in enumerate(fields):
-        if k == tag:
-            del fields[i]
-            return True
-    return False
+    def has_tag(self, tag: str) -> bool:
+        return tag in self._first
 
+    def index(self, tag: str) -> int:
+        return self._first.get(tag, -1)
 
-def first_value(fields: list[tuple[str, str]], tag: str, default: str = "") -> str:
-    for k, v in fields:
-        if k == tag:
-            return v
-    return default
+    def first_value(self, tag: str, default: str = "") -> str:
+        i = self._first.get(tag)
+        return default if i is None else self._fields[i][1]
 
+    def append(self, tag: str, value: str) -> None:
+        self._first.setdefault(tag, len(self._fields))
+        self._fields.append((tag, value))
 
+    def set_or_add(self, tag: str, value: str) -> None:
+        i = self._first.get(tag)
+        if i is None:
+            self.append(tag, value)
+        else:
+            self._fields[i] = (tag, value)
+
+    def remove_first_tag(self, tag: str) -> bool:
+        i = self._first.get(tag)
+        if i is None:
+            return False
+        del self._fields[i]
+        # Shift the positions behind the removed field instead of rebuilding the whole index.
+        del self._first[tag]
+        for k, j in self._first.items():
+            if j > i:
+                self._first[k] = j - 1
+        for j in range(i, len(self._fields)):
+            if self._fields[j][0] == tag:
+                self._first[tag] = j
+                break
+        return True
+
+    def insert_slice(self, at: int, block: list[tuple[str, str]]) -> None:
+        self._fields[at:at] = block
+        if at < len(self._fields) - len(block):
+            shift = len(block)
+            for k, j in self._first.items():
+                if j >= at:
+                    self._first[k] = j + shift
+        for i, (k, _) in enumerate(block, start=at):
+            if self._first.get(k, i + 1) > i:
+                self._first[k] = i
+
+
+@functools.lru_cache(maxsize=4096)
 def sanitize_party(text: str, max_len: int = 12) -> str:
-    clean = re.sub(r"[^A-Z0-9]", "", text.upper())
+    clean = text.upper().translate(NON_ALNUM_TABLE)
+    if not clean.isascii():
+        clean = NON_ALNUM_RE.sub("", clean)
     if not clean:
         clean = "PARTY"
     return clean[:max_len]
 
 
-def choose_unique(items: list[str], count: int) -> list[str]:
-    out: list[str] = []
-    seen: set[str] = set()
+def choose_unique(items: Iterable[str], count: int) -> list[str]:
+    # A dict is an insertion-ordered set: one hash per item instead of a set probe, a set add and a list append.
+    out: dict[str, None] = {}
     for item in items:
-        if item in seen:
-            continue
-        seen.add(item)
-        out.append(item)
+        out[item] = None
         if len(out) >= count:
             break
-    return out
+    return list(out)
+
+
+def classify_participants(names: Iterable[str], count: int) -> tuple[list[str], list[str], list[str]]:
+    """
+    Pick up to count unique bank, fund and company names in a single pass.
+
+    The categories overlap (a holding company is both a bank and a company), so each name is tested against every
+    category that still needs names, and the scan stops once all three are full.
+    """
+    banks: dict[str, None] = {}
+    funds: dict[str, None] = {}
+    companies: dict[str, None] = {}
+    for name in names:
+        if len(banks) < count and name not in banks and BANK_NAME_RE.search(name):
+            banks[name] = None
+        if len(funds) < count and name not in funds and FUND_NAME_RE.search(name):
+            funds[name] = None
+        if len(companies) < count and name not in companies and not NON_COMPANY_NAME_RE.search(name):
+            companies[name] = None
+        if len(banks) >= count and len(funds) >= count and len(companies) >= count:
+            break
+    return list(banks), list(funds), list(companies)
 
 
-def load_reference_data() -> dict:
+def load_reference_data(cache_dir: Path | None = None, refresh: bool = False) -> dict:
+    """
+    Download and parse the reference data, or reuse today's copy cached in cache_dir.
+
+    The sources change at most daily, so a complete download is cached per UTC date; refresh forces a new download.
+    """
+    cache_path = None
+    if cache_dir is not None:
+        cache_path = cache_dir / f"cache_{datetime.now(UTC):%Y%m%d}.json"
+        if cache_path.exists() and not refresh:
+            try:
+                return json_loads(cache_path.read_bytes())
+            except (OSError, ValueError) as exc:
+                warn(f"Ignoring unreadable reference data cache {cache_path}: {exc}")
+
     ref = default_reference_data()
+    # The sources are independent, so download them all up front in parallel.
+    bodies = fetch_all(REFERENCE_URLS)
+
     all_rows: list[dict[str, str]] = []
-    for url in (
-        "https://www.nasdaqtrader.com/dynamic/SymDir/nasdaqlisted.txt",
-        "https://www.nasdaqtrader.com/dynamic/SymDir/otherlisted.txt",
-    ):
+    for key in ("nasdaq_listed", "nasdaq_other"):
         try:
-            text = fetch_text(url)
-            reader = csv.DictReader(io.StringIO(text), delimiter="|")
+            text = fetched_body(bodies, key)
+            reader = csv.reader(text.splitlines(), delimiter="|")
+            header = next(reader, [])
+            symbol_i = header.index("Symbol") if "Symbol" in header else header.index("ACT Symbol")
+            name_i = header.index("Security Name")
+            etf_i = header.index("ETF") if "ETF" in header else -1
+            last_i = max(symbol_i, name_i, etf_i)
             for row in reader:
-                symbol = (row.get("Symbol") or row.get("ACT Symbol") or "").strip()
-                name = (row.get("Security Name") or "").strip()
-                etf = (row.get("ETF") or "N").strip()
-                if not symbol or etf == "Y" or "File Creation Time" in symbol:
+                if len(row) <= last_i:
+                    continue
+                symbol = row[symbol_i].strip()
+                name = row[name_i].strip()
+                if not symbol or (etf_i >= 0 and row[etf_i].strip() == "Y") or "File Creation Time" in symbol:
                     continue
                 all_rows.append({"symbol": symbol, "name": name})
         except Exception as exc:
-            warn(f"NASDAQ reference fetch failed ({url}): {exc}")
+            warn(f"NASDAQ reference fetch failed ({REFERENCE_URLS[key]}): {exc}")
 
     if all_rows:
         equities = []
-        for pair in choose_unique([f"{r['symbol']}|{r['name']}" for r in all_rows], 120):
+        for pair in choose_unique((f"{r['symbol']}|{r['name']}" for r in all_rows), 120):
             s, n = pair.split("|", 1)
             equities.append({"symbol": s, "name": n})
         ref["equities"] = equities
 
-        banks = choose_unique(
-            [
-                r["name"]
-                for r in all_rows
-                if re.search(r"\b(BANK|BANCORP|FINANCIAL|TRUST|HOLDINGS)\b", r["name"], re.IGNORECASE)
-            ],
-            40,
-        )
-        funds = choose_unique(
-            [
-                r["name"]
-                for r in all_rows
-                if re.search(r"\b(FUND|CAPITAL|ASSET|ADVIS|MANAGEMENT|PARTNERS)\b", r["name"], re.IGNORECASE)
-            ],
-            40,
-        )
-        companies = choose_unique(
-            [
-                r["name"]
-                for r in all_rows
-                if not re.search(r"\b(FUND|CAPITAL|ASSET|ADVIS|MANAGEMENT|BANK|BANCORP|TRUST)\b", r["name"], re.IGNORECASE)
-            ],
-            40,
-        )
+        banks, funds, companies = classify_participants((r["name"] for r in all_rows), 40)
         if banks:
             ref["participants"]["banks"] = banks
         if funds:
@@ -223,8 +470,9 @@ def load_reference_data() -> dict:
             ref["participants"]["companies"] = companies
 
     try:
-        ecb = fetch_text("https://www.ecb.europa.eu/stats/eurofxref/eurofxref-hist.csv")
-        header = ecb.splitlines()[0].split(",")
+        ecb = fetched_body(bodies, "ecb_fx")
+        # Only the header row is needed; the body is the full daily rate history.
+        header = ecb.partition("\n")[0].rstrip("\r").split(",")
         majors = [c for c in ["USD", "JPY", "GBP", "CHF", "CAD", "AUD", "NZD", "CNY", "NOK", "SEK"] if c in header]
         fx_pairs = [f"EUR/{c}" for c in majors] + ["USD/JPY", "GBP/USD", "USD/CHF", "AUD/USD"]
         fx_pairs = choose_unique(fx_pairs, 16)
@@ -233,12 +481,8 @@ def load_reference_data() -> dict:
     except Exception as exc:
         warn(f"ECB FX reference fetch failed: {exc}")
 
-    treas_url = (
-        "https://api.fiscaldata.treasury.gov/services/api/fiscal_service/v1/debt/mspd/mspd_table_5"
-        "?filter=record_date:gte:2025-01-01&sort=-record_date&page%5Bsize%5D=60"
-    )
     try:
-        treas = json.loads(fetch_text(treas_url))
+        treas = json_loads(fetched_body(bodies, "us_treasury"))
         bonds = []
         for row in treas.get("data", []):
             cusip = (row.get("cusip") or "").strip()
@@ -260,7 +504,7 @@ def load_reference_data() -> dict:
         warn(f"US Treasury reference fetch failed: {exc}")
 
     try:
-        nyfed = json.loads(fetch_text("https://markets.newyorkfed.org/api/rates/all/latest.json"))
+        nyfed = json_loads(fetched_body(bodies, "nyfed_rates"))
         repo = []
         for row in nyfed.get("refRates", []):
             t = (row.get("type") or "").strip()
@@ -273,9 +517,9 @@ def load_reference_data() -> dict:
         warn(f"NY Fed rates reference fetch failed: {exc}")
 
     try:
-        cftc = fetch_text("https://www.cftc.gov/dea/newcot/FinFutWk.txt")
+        cftc = fetched_body(bodies, "cftc_fin_fut")
         futures = []
-        for row in csv.reader(io.StringIO(cftc)):
+        for row in csv.reader(cftc.splitlines()):
             if not row or row[0].startswith("Market and Exchange Names"):
                 continue
             market = row[0].strip()
@@ -289,6 +533,13 @@ def load_reference_data() -> dict:
     except Exception as exc:
         warn(f"CFTC futures reference fetch failed: {exc}")
 
+    # Partially failed downloads are not cached so that the next run retries them.
+    if cache_path is not None and not any(isinstance(body, Exception) for body in bodies.values()):
+        for stale in cache_path.parent.glob("cache_*.json"):
+            if stale != cache_path:
+                stale.unlink(missing_ok=True)
+        cache_path.write_bytes(json_dumps_indented(ref))
+
     return ref
 
 
@@ -306,34 +557,39 @@ def parse_members(parent: ET.Element) -> list[Member]:
 
 
 def load_dictionary_model(dict_path: Path) -> DictionaryModel:
-    root = ET.fromstring(dict_path.read_text(encoding="utf-8"))
-
     field_numbers: dict[str, int] = {}
     field_types: dict[str, str] = {}
-    for f in root.findall("./fields/field"):
-        name = f.attrib.get("name", "")
-        number = f.attrib.get("number", "0")
-        ftype = f.attrib.get("type", "STRING")
-        if not name:
-            continue
-        try:
-            field_numbers[name] = int(number)
-        except ValueError:
-            continue
-        field_types[name] = ftype
-
     messages: dict[str, list[Member]] = {}
-    for m in root.findall("./messages/message"):
-        msg_type = m.attrib.get("msgtype", "")
-        if not msg_type:
-            continue
-        messages[msg_type] = parse_members(m)
-
     components: dict[str, list[Member]] = {}
-    for c in root.findall("./components/component"):
-        cname = c.attrib.get("name", "")
-        if cname:
-            components[cname] = parse_members(c)
+
+    # Stream the document: each <root>/<section>/<entry> element is handled once it is complete and then freed.
+    path: list[str] = []
+    for event, elem in ET.iterparse(dict_path, events=("start", "end")):
+        if event == "start":
+            path.append(elem.tag)
+            continue
+        path.pop()
+        if len(path) != 2:
+            continue
+        section = path[1]
+        if section == "fields" and elem.tag == "field":
+            name = elem.attrib.get("name", "")
+            if name:
+                try:
+                    field_numbers[name] = int(elem.attrib.get("number", "0"))
+                except ValueError:
+                    pass
+                else:
+                    field_types[name] = elem.attrib.get("type", "STRING")
+        elif section == "messages" and elem.tag == "message":
+            msg_type = elem.attrib.get("msgtype", "")
+            if msg_type:
+                messages[msg_type] = parse_members(elem)
+        elif section == "components" and elem.tag == "component":
+            cname = elem.attrib.get("name", "")
+            if cname:
+                components[cname] = parse_members(elem)
+        elem.clear()
 
     return DictionaryModel(field_numbers=field_numbers, field_types=field_types, messages=messages, components=components)
 
@@ -341,31 +597,39 @@ def load_dictionary_model(dict_path: Path) -> DictionaryModel:
 def load_base_version_messages(base_samples_dir: Path) -> dict[str, list[list[tuple[str, str]]]]:
     out: dict[str, list[list[tuple[str, str]]]] = {}
     for path in sorted(base_samples_dir.glob("FIX*.messages")):
-        lines = [ln.strip() for ln in path.read_text(encoding="utf-8").splitlines() if ln.strip() and not ln.startswith("#")]
-        parsed = [parse_fix_line(ln) for ln in lines]
+        parsed = [
+            parse_fix_line(stripped)
+            for ln in path.read_text(encoding="utf-8").splitlines()
+            if not ln.startswith("#") and (stripped := ln.strip())
+        ]
         if parsed:
             out[path.stem] = parsed
     return out
 
 
 def payload_for_index(i: int) -> str:
-    short = "INFO-" + str(i)
-    medium = "ALERT-" + ("ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789" * 12)
-    very_long = "RISK-" + ("ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789" * 110)
     if i % 40 == 0:
-        return very_long
+        return VERY_LONG_PAYLOAD
     if i % 7 == 0:
-        return medium
-    return short
+        return MEDIUM_PAYLOAD
+    return "INFO-" + str(i)
 
 
 def msg_time(seq: int) -> str:
-    t = datetime.combine(date(2026, 2, 19), time(12, 0, 0), tzinfo=UTC) + timedelta(seconds=seq)
-    return t.strftime("%Y%m%d-%H:%M:%S.000")
+    # Seconds after MSG_BASE_DATE 12:00:00 UTC, formatted with integer arithmetic instead of datetime/strftime.
+    days, secs = divmod(MSG_BASE_SECONDS + seq, 86400)
+    hours, rem = divmod(secs, 3600)
+    minutes, seconds = divmod(rem, 60)
+    day = MSG_BASE_DAY if days == 0 else f"{MSG_BASE_DATE + timedelta(days=days):%Y%m%d}"
+    return f"{day}-{hours:02d}:{minutes:02d}:{seconds:02d}.000"
 
 
 def first_member_tag(model: DictionaryModel, member: Member, seen_components: set[str] | None = None) -> int | None:
-    seen_components = seen_components or set()
+    if seen_components is None:
+        key = (member.kind, member.name)
+        if key not in model.first_tag_cache:
+            model.first_tag_cache[key] = first_member_tag(model, member, set())
+        return model.first_tag_cache[key]
     if member.kind in {"field", "group"}:
         return model.field_numbers.get(member.name)
     if member.kind != "component":
@@ -411,23 +675,47 @@ def collect_required_top_level_field_names(
             collect_required_top_level_field_names(model, model.components.get(m.name, []), out, seen_components)
 
 
+def message_meta(model: DictionaryModel, msg_type: str) -> MessageMeta:
+    meta = model.message_meta_cache.get(msg_type)
+    if meta is not None:
+        return meta
+    members = model.messages.get(msg_type, [])
+    groups: list[Member] = []
+    collect_groups(model, members, groups)
+    direct_groups = [g for g in collect_direct_groups(members) if g.name in model.field_numbers and g.children]
+    required_names: list[str] = []
+    collect_required_top_level_field_names(model, members, required_names)
+    meta = MessageMeta(
+        members=members,
+        groups=tuple(groups),
+        direct_groups=tuple(direct_groups),
+        required_names=tuple(required_names),
+        required_tags=tuple(
+            sys.intern(str(model.field_numbers[n])) for n in required_names if n in model.field_numbers
+        ),
+        group_tags={g.name: sys.intern(str(model.field_numbers[g.name])) for g in groups + direct_groups},
+    )
+    model.message_meta_cache[msg_type] = meta
+    return meta
+
+
 def gen_field_value(model: DictionaryModel, field_name: str, ref: dict, seq: int, idx: int, rng: random.Random) -> str:
-    funds = ref["participants"].get("funds") or ["ALPHA CAPITAL"]
-    banks = ref["participants"].get("banks") or ["GLOBAL BANK"]
-    comps = ref["participants"].get("companies") or ["ACME INC"]
+    participants = ref["participants"]
+    funds = participants.get("funds") or ["ALPHA CAPITAL"]
+    comps = participants.get("companies") or ["ACME INC"]
 
     if field_name in {"PartyID", "AllocAccount", "ClientID", "OrderID", "ClOrdID", "OrigClOrdID", "ExecID"}:
         return sanitize_party(f"{funds[idx % len(funds)]}{seq}", 20)
     if field_name in {"PartyIDSource"}:
         return "D"
     if field_name in {"PartyRole"}:
-        return str(rng.choice([1, 3, 12, 24]))
+        return rng.choice(PARTY_ROLES)
     if field_name in {"Side"}:
-        return rng.choice(["1", "2"])
+        return rng.choice(SIDES)
     if field_name in {"Price", "LastPx", "AvgPx", "StopPx"}:
-        return f"{80 + (idx % 50) * 0.77:.2f}"
+        return FIELD_PRICES[idx % len(FIELD_PRICES)]
     if field_name in {"OrderQty", "LastQty", "LeavesQty", "CumQty", "AllocQty"}:
-        return str(50 + (idx % 30) * 10)
+        return FIELD_QTYS[idx % len(FIELD_QTYS)]
     if field_name in {"Symbol"}:
         equities = ref.get("equities") or [{"symbol": "IBM"}]
         return equities[idx % len(equities)]["symbol"]
@@ -437,32 +725,36 @@ def gen_field_value(model: DictionaryModel, field_name: str, ref: dict, seq: int
     if field_name in {"SecurityIDSource"}:
         return "1"
     if field_name in {"SecurityType"}:
-        return rng.choice(["CS", "FOR", "TBOND", "FUT", "REPO"])
+        return rng.choice(SECURITY_TYPES)
     if field_name in {"TransactTime", "SendingTime"}:
         return msg_time(seq)
     if field_name in {"Text", "TestReqID"}:
         return payload_for_index(idx)
     if field_name in {"SenderCompID"}:
-        return sanitize_party(funds[idx % len(funds)])
+        fund_ids = participants["funds_sanitized"] or [sanitize_party("ALPHA CAPITAL")]
+        return fund_ids[idx % len(fund_ids)]
     if field_name in {"TargetCompID"}:
-        return sanitize_party(banks[idx % len(banks)])
+        bank_ids = participants["banks_sanitized"] or [sanitize_party("GLOBAL BANK")]
+        return bank_ids[idx % len(bank_ids)]
 
     ftype = model.field_types.get(field_name, "STRING").upper()
+    # randrange/random() draw exactly what randint/uniform would, minus their extra Python-level call.
     if ftype in {"INT", "SEQNUM", "LENGTH", "NUMINGROUP"}:
-        return str(rng.randint(1, 100))
+        return str(rng.randrange(1, 101))
     if ftype in {"QTY", "PRICE", "PRICEOFFSET", "AMT", "PERCENTAGE", "DOUBLE", "FLOAT"}:
-        return f"{rng.uniform(1.0, 250.0):.2f}"
+        return f"{1.0 + 249.0 * rng.random():.2f}"
     if ftype in {"BOOLEAN"}:
-        return rng.choice(["Y", "N"])
+        return rng.choice(BOOLEAN_VALUES)
     if ftype in {"CHAR"}:
-        return rng.choice(["A", "B", "C", "D", "1", "2"])
+        return rng.choice(CHAR_VALUES)
     if ftype in {"UTCTIMESTAMP"}:
         return msg_time(seq)
     if ftype in {"UTCDATEONLY", "LOCALMKTDATE"}:
         return "20260219"
     if field_name.endswith("ID"):
         return sanitize_party(f"{comps[idx % len(comps)]}{seq}", 20)
-    return sanitize_party(comps[idx % len(comps)], 16)
+    company_ids = participants["companies_sanitized"] or [sanitize_party("ACME INC", 16)]
+    return company_ids[idx % len(company_ids)]
 
 
 def build_group_block(
@@ -479,23 +771,24 @@ def build_group_block(
     group_tag = str(model.field_numbers[group_member.name])
     block.append((group_tag, str(entry_count)))
 
+    # The entry layout is the same for every entry, so resolve the child tags once.
+    child_tags = [
+        (str(model.field_numbers[child.name]), child)
+        for child in group_member.children
+        if child.kind == "field" and child.name in model.field_numbers
+    ]
     for entry_idx in range(entry_count):
-        for child in group_member.children:
-            if child.kind != "field":
-                continue
-            tag = model.field_numbers.get(child.name)
-            if tag is None:
-                continue
+        for tag, child in child_tags:
             if semantic_invalid and entry_idx == entry_count - 1 and child.required and rng.random() < 0.5:
                 # syntactically valid but semantically incomplete group entry
                 semantic_invalid = False
                 continue
-            block.append((str(tag), gen_field_value(model, child.name, ref, seq + entry_idx, idx + entry_idx, rng)))
+            block.append((tag, gen_field_value(model, child.name, ref, seq + entry_idx, idx + entry_idx, rng)))
     return block
 
 
 def insert_group_block_at_member_order(
-    fields: list[tuple[str, str]],
+    fields: OrderedFields,
     model: DictionaryModel,
     message_members: list[Member],
     group_member: Member,
@@ -519,19 +812,16 @@ def insert_group_block_at_member_order(
             later_tag = first_member_tag(model, later)
             if later_tag is None:
                 continue
-            later_tag_str = str(later_tag)
-            for idx, (tag, _) in enumerate(fields):
-                if tag == later_tag_str:
-                    insert_at = idx
-                    break
-            if insert_at != len(fields):
+            later_index = fields.index(str(later_tag))
+            if later_index >= 0:
+                insert_at = later_index
                 break
 
-    fields[insert_at:insert_at] = block
+    fields.insert_slice(insert_at, block)
 
 
 def ensure_required_members(
-    fields: list[tuple[str, str]],
+    fields: OrderedFields,
     model: DictionaryModel,
     members: list[Member],
     ref: dict,
@@ -541,19 +831,20 @@ def ensure_required_members(
     seen_components: set[str] | None = None,
 ) -> None:
     seen_components = seen_components or set()
+    field_numbers = model.field_numbers
     for member in members:
         if not member.required:
             continue
         if member.kind == "field":
-            tag_num = model.field_numbers.get(member.name)
+            tag_num = field_numbers.get(member.name)
             if tag_num is None:
                 continue
             tag = str(tag_num)
-            if not has_tag(fields, tag):
-                fields.append((tag, gen_field_value(model, member.name, ref, seq, idx, rng)))
+            if not fields.has_tag(tag):
+                fields.append(tag, gen_field_value(model, member.name, ref, seq, idx, rng))
             continue
         if member.kind == "group":
-            if member.name not in model.field_numbers:
+            if member.name not in field_numbers:
                 continue
             group_block = build_group_block(model, member, ref, seq, idx, rng, entry_count=1, semantic_invalid=False)
             insert_group_block_at_member_order(fields, model, members, member, group_block)
@@ -574,144 +865,193 @@ def ensure_required_members(
             )
 
 
+def set_equity_instrument(fields: OrderedFields, i: int, ref: dict) -> None:
+    equities = ref["equities"]
+    if not equities:
+        return
+    fields.set_or_add("55", equities[i % len(equities)]["symbol"])
+    fields.set_or_add("167", "CS")
+
+
+def set_fx_instrument(fields: OrderedFields, i: int, ref: dict) -> None:
+    fx_pairs = ref["fx_pairs"]
+    if not fx_pairs:
+        return
+    fields.set_or_add("55", fx_pairs[i % len(fx_pairs)])
+    fields.set_or_add("167", "FOR")
+    fields.set_or_add("15", "USD")
+
+
+def set_bond_instrument(fields: OrderedFields, i: int, ref: dict) -> None:
+    bonds = ref["bonds"]
+    if not bonds:
+        return
+    cusip = bonds[i % len(bonds)]["cusip"]
+    fields.set_or_add("55", cusip)
+    fields.set_or_add("48", cusip)
+    fields.set_or_add("22", "1")
+    fields.set_or_add("167", "TBOND")
+
+
+def set_future_instrument(fields: OrderedFields, i: int, ref: dict) -> None:
+    futures = ref["futures"]
+    if not futures:
+        return
+    code = futures[i % len(futures)].split(":", 1)[0]
+    fields.set_or_add("55", f"FUT{code}")
+    fields.set_or_add("167", "FUT")
+    fields.set_or_add("207", "CME")
+    fields.set_or_add("200", "202603")
+
+
+def set_repo_instrument(fields: OrderedFields, i: int, ref: dict) -> None:
+    repo = ref["repo"]
+    if not repo:
+        return
+    fields.set_or_add("55", repo[i % len(repo)])
+    fields.set_or_add("167", "REPO")
+    fields.set_or_add("15", "USD")
+
+
+# Indexed by message number, cycling equity, FX, bond, future and repo instruments.
+INSTRUMENT_BUILDERS = (
+    set_equity_instrument,
+    set_fx_instrument,
+    set_bond_instrument,
+    set_future_instrument,
+    set_repo_instrument,
+)
+
+
 def mutate_template(
-    tpl: list[tuple[str, str]],
+    tpl: OrderedFields,
     version: str,
     i: int,
     seq: int,
     ref: dict,
     model: DictionaryModel,
     semantic_invalid: bool,
-) -> list[tuple[str, str]]:
-    rng = random.Random(1000 + i)
-    fields = [(k, v) for (k, v) in tpl]
+    rng: random.Random,
+) -> OrderedFields:
+    # Reseeding a shared generator keeps each message reproducible without allocating a new one per message.
+    rng.seed(1000 + i)
+    fields = tpl.copy()
 
-    banks = ref["participants"]["banks"] or ["GLOBAL BANK PLC"]
-    funds = ref["participants"]["funds"] or ["ALPHA CAPITAL MGMT"]
+    bank_ids = ref["participants"]["banks_sanitized"] or [sanitize_party("GLOBAL BANK PLC")]
+    fund_ids = ref["participants"]["funds_sanitized"] or [sanitize_party("ALPHA CAPITAL MGMT")]
 
-    sender = sanitize_party(funds[i % len(funds)])
-    target = sanitize_party(banks[(i + 3) % len(banks)])
+    sender = fund_ids[i % len(fund_ids)]
+    target = bank_ids[(i + 3) % len(bank_ids)]
 
-    set_or_add(fields, "34", str(seq))
-    set_or_add(fields, "49", sender)
-    set_or_add(fields, "56", target)
-    set_or_add(fields, "52", msg_time(seq))
+    fields.set_or_add("34", str(seq))
+    fields.set_or_add("49", sender)
+    fields.set_or_add("56", target)
+    fields.set_or_add("52", msg_time(seq))
 
     if version == "FIX50":
-        set_or_add(fields, "8", "FIXT.1.1")
-        set_or_add(fields, "1128", "7")
-        if first_value(fields, "35") == "A":
-            set_or_add(fields, "1137", "7")
+        fields.set_or_add("8", "FIXT.1.1")
+        fields.set_or_add("1128", "7")
+        if fields.first_value("35") == "A":
+            fields.set_or_add("1137", "7")
     elif version == "FIX50SP1":
-        set_or_add(fields, "8", "FIXT.1.1")
-        set_or_add(fields, "1128", "8")
-        if first_value(fields, "35") == "A":
-            set_or_add(fields, "1137", "8")
+        fields.set_or_add("8", "FIXT.1.1")
+        fields.set_or_add("1128", "8")
+        if fields.first_value("35") == "A":
+            fields.set_or_add("1137", "8")
     elif version == "FIX50SP2":
-        set_or_add(fields, "8", "FIXT.1.1")
-        set_or_add(fields, "1128", "9")
-        if first_value(fields, "35") == "A":
-            set_or_add(fields, "1137", "9")
-
-    if any(k == "55" for k, _ in fields):
-        mode = i % 5
-        if mode == 0 and ref["equities"]:
-            eq = ref["equities"][i % len(ref["equities"])]
-            set_or_add(fields, "55", eq["symbol"])
-            set_or_add(fields, "167", "CS")
-        elif mode == 1 and ref["fx_pairs"]:
-            set_or_add(fields, "55", ref["fx_pairs"][i % len(ref["fx_pairs"])])
-            set_or_add(fields, "167", "FOR")
-            set_or_add(fields, "15", "USD")
-        elif mode == 2 and ref["bonds"]:
-            b = ref["bonds"][i % len(ref["bonds"])]
-            set_or_add(fields, "55", b["cusip"])
-            set_or_add(fields, "48", b["cusip"])
-            set_or_add(fields, "22", "1")
-            set_or_add(fields, "167", "TBOND")
-        elif mode == 3 and ref["futures"]:
-            code = ref["futures"][i % len(ref["futures"])].split(":", 1)[0]
-            set_or_add(fields, "55", f"FUT{code}")
-            set_or_add(fields, "167", "FUT")
-            set_or_add(fields, "207", "CME")
-            set_or_add(fields, "200", "202603")
-        elif ref["repo"]:
-            set_or_add(fields, "55", ref["repo"][i % len(ref["repo"])])
-            set_or_add(fields, "167", "REPO")
-            set_or_add(fields, "15", "USD")
-
-    if any(k == "11" for k, _ in fields):
-        set_or_add(fields, "11", f"{version}-ORD-{i+1:05d}")
-
-    if any(k == "38" for k, _ in fields):
-        set_or_add(fields, "38", str(100 + (i % 25) * 25))
-
-    if any(k == "44" for k, _ in fields):
-        set_or_add(fields, "44", f"{20 + (i % 70) * 1.37:.2f}")
+        fields.set_or_add("8", "FIXT.1.1")
+        fields.set_or_add("1128", "9")
+        if fields.first_value("35") == "A":
+            fields.set_or_add("1137", "9")
+
+    if fields.has_tag("55"):
+        INSTRUMENT_BUILDERS[i % len(INSTRUMENT_BUILDERS)](fields, i, ref)
+
+    if fields.has_tag("11"):
+        fields.set_or_add("11", f"{version}-ORD-{i+1:05d}")
+
+    if fields.has_tag("38"):
+        fields.set_or_add("38", ORDER_QTYS[i % len(ORDER_QTYS)])
+
+    if fields.has_tag("44"):
+        fields.set_or_add("44", ORDER_PRICES[i % len(ORDER_PRICES)])
 
     payload = payload_for_index(i)
-    if any(k == "112" for k, _ in fields):
-        set_or_add(fields, "112", payload)
+    if fields.has_tag("112"):
+        fields.set_or_add("112", payload)
     else:
-        set_or_add(fields, "58", payload)
-
-    msg_type = first_value(fields, "35")
-    message_members = model.messages.get(msg_type, [])
-    ensure_required_members(fields, model, message_members, ref, seq, i, rng)
+        fields.set_or_add("58", payload)
 
-    groups: list[Member] = []
-    collect_groups(model, message_members, groups)
-    direct_groups = [g for g in collect_direct_groups(message_members) if g.name in model.field_numbers and g.children]
+    msg_type = fields.first_value("35")
+    meta = message_meta(model, msg_type)
+    ensure_required_members(fields, model, meta.members, ref, seq, i, rng)
 
     corrupted_via_group = False
-    if groups and msg_type in {"D", "8", "AE", "AB", "A"}:
-        group_pool = direct_groups if direct_groups else groups
+    if meta.groups and msg_type in {"D", "8", "AE", "AB", "A"}:
+        group_pool = meta.direct_groups if meta.direct_groups else meta.groups
         group = group_pool[i % len(group_pool)]
         # semantic_invalid path always includes a dictionary-known group and then corrupts it.
         entries = 2 if semantic_invalid else 1 + (i % 2)
         group_block = build_group_block(model, group, ref, seq, i, rng, entries, semantic_invalid)
-        insert_group_block_at_member_order(fields, model, message_members, group, group_block)
+        insert_group_block_at_member_order(fields, model, meta.members, group, group_block)
         if semantic_invalid:
-            for j, (k, v) in enumerate(fields):
-                if k == str(model.field_numbers[group.name]):
-                    fields[j] = (k, str(entries + 1))
-                    break
+            fields.set_or_add(meta.group_tags[group.name], str(entries + 1))
             corrupted_via_group = True
 
     if semantic_invalid:
-        required_names: list[str] = []
-        collect_required_top_level_field_names(model, message_members, required_names)
         removed = False
-        for name in required_names:
-            tag_num = model.field_numbers.get(name)
-            if tag_num is None:
-                continue
-            tag = str(tag_num)
+        for tag in meta.required_tags:
             if tag in {"8", "35"}:
                 continue
-            if remove_first_tag(fields, tag):
+            if fields.remove_first_tag(tag):
                 removed = True
                 break
         if not removed:
             # last-resort semantic corruption: wrong MsgType while keeping syntax valid.
-            set_or_add(fields, "35", "ZZ")
+            fields.set_or_add("35", "ZZ")
 
     return fields
 
 
-def garble_message(message: str, i: int) -> str:
-    mode = i % 4
-    if mode == 0:
-        # Break BeginString tag parsing.
-        return message.replace("8=", "X=", 1)
-    if mode == 1:
-        # Corrupt MsgType tag key.
-        return re.sub(r"\b35=", "35-", message, count=1)
-    if mode == 2:
-        # Remove all delimiters to prevent proper tokenization.
-        return message.replace("|", "")
+def break_begin_string(message: str) -> str:
+    # Break BeginString tag parsing.
+    return message.replace("8=", "X=", 1)
+
+
+def corrupt_msg_type_tag(message: str) -> str:
+    # Corrupt MsgType tag key.
+    if message.startswith("35="):
+        return "35-" + message[3:]
+    return message.replace("|35=", "|35-", 1)
+
+
+def strip_delimiters(message: str) -> str:
+    # Remove all delimiters to prevent proper tokenization.
+    return message.replace("|", "")
+
+
+def drop_begin_string(message: str) -> str:
     # Drop BeginString token entirely.
-    return re.sub(r"^8=[^|]*\|", "", message, count=1)
+    end = message.find("|")
+    if not message.startswith("8=") or end < 0:
+        return message
+    return message[end + 1 :]
+
+
+GARBLERS = (break_begin_string, corrupt_msg_type_tag, strip_delimiters, drop_begin_string)
+
+
+def garble_message(message: str, i: int) -> str:
+    return GARBLERS[i % len(GARBLERS)](message)
+
+
+def with_sanitized_participants(ref: dict) -> dict:
+    """Return a shallow copy of ref whose participants also carry the sanitized forms used in messages."""
+    participants = dict(ref["participants"])
+    participants["banks_sanitized"] = [sanitize_party(b) for b in participants.get("banks") or []]
+    participants["funds_sanitized"] = [sanitize_party(f) for f in participants.get("funds") or []]
+    participants["companies_sanitized"] = [sanitize_party(c, 16) for c in participants.get("companies") or []]
+    return {**ref, "participants": participants}
 
 
 def generate_for_version(
@@ -722,48 +1062,102 @@ def generate_for_version(
     num_garbled: int,
     ref: dict,
     model: DictionaryModel,
-) -> tuple[list[str], list[str], list[str]]:
-    correct: list[str] = []
-    semantic_bad: list[str] = []
-    garbled: list[str] = []
+    correct_out: TextIO,
+    semantic_out: TextIO,
+    garbled_out: TextIO,
+    combined_out: TextIO,
+) -> None:
+    """Write each generated message to its category file and to the combined file as soon as it is built."""
+    # Only the first num_garbled correct messages are ever garbled, so only those are retained.
+    garble_sources: list[str] = []
+    rng = random.Random()
+    # Sanitize the fixed participant pools once; the reference dict written to disk is left untouched.
+    ref = with_sanitized_participants(ref)
+    # Index each template once; every message then starts from a cheap copy of its template.
+    indexed_templates = [OrderedFields(tpl) for tpl in templates]
 
     seq = 1
     for i in range(num_correct):
-        tpl = templates[i % len(templates)]
-        correct.append(render_fix_line(mutate_template(tpl, version, i, seq, ref, model, semantic_invalid=False)))
+        tpl = indexed_templates[i % len(indexed_templates)]
+        message = render_fix_line(mutate_template(tpl, version, i, seq, ref, model, semantic_invalid=False, rng=rng))
+        correct_out.write(message + "\n")
+        combined_out.write(message + "\n")
+        if i < num_garbled:
+            garble_sources.append(message)
         seq += 1
 
-    semantic_templates: list[list[tuple[str, str]]] = []
-    group_semantic_templates: list[list[tuple[str, str]]] = []
-    for tpl in templates:
-        msg_type = first_value(tpl, "35")
-        members = model.messages.get(msg_type, [])
-        groups: list[Member] = []
-        collect_groups(model, members, groups)
-        req_fields: list[str] = []
-        collect_required_top_level_field_names(model, members, req_fields)
-        if groups:
+    semantic_templates: list[OrderedFields] = []
+    group_semantic_templates: list[OrderedFields] = []
+    for tpl in indexed_templates:
+        meta = message_meta(model, tpl.first_value("35"))
+        if meta.groups:
             group_semantic_templates.append(tpl)
-        if groups or req_fields:
+        if meta.groups or meta.required_names:
             semantic_templates.append(tpl)
     if group_semantic_templates:
         semantic_templates = group_semantic_templates
     if not semantic_templates:
-        semantic_templates = templates
+        semantic_templates = indexed_templates
 
     for i in range(num_semantic_incorrect):
         tpl = semantic_templates[(i + num_correct) % len(semantic_templates)]
-        semantic_bad.append(
-            render_fix_line(mutate_template(tpl, version, i + num_correct, seq, ref, model, semantic_invalid=True))
+        message = render_fix_line(
+            mutate_template(tpl, version, i + num_correct, seq, ref, model, semantic_invalid=True, rng=rng)
         )
+        semantic_out.write(message + "\n")
+        combined_out.write(message + "\n")
         seq += 1
 
     # Garbled messages are derived from otherwise realistic (and mostly valid) payloads.
     for i in range(num_garbled):
-        source = correct[i % len(correct)] if correct else render_fix_line(templates[i % len(templates)])
-        garbled.append(garble_message(source, i))
+        if garble_sources:
+            source = garble_sources[i % len(garble_sources)]
+        else:
+            source = render_fix_line(templates[i % len(templates)])
+        message = garble_message(source, i)
+        garbled_out.write(message + "\n")
+        combined_out.write(message + "\n")
 
-    return correct, semantic_bad, garbled
+
+def write_version_files(
+    version: str,
+    templates: list[list[tuple[str, str]]],
+    dict_path: Path,
+    out_dir: Path,
+    num_correct: int,
+    num_semantic_incorrect: int,
+    num_garbled: int,
+    ref: dict,
+) -> tuple[str, Path, Path, Path, Path, int]:
+    model = load_dictionary_model(dict_path)
+
+    total = num_correct + num_semantic_incorrect + num_garbled
+    correct_file = out_dir / f"{version}_realistic_correct_{num_correct}.messages"
+    semantic_file = out_dir / f"{version}_realistic_semantic_incorrect_{num_semantic_incorrect}.messages"
+    garbled_file = out_dir / f"{version}_realistic_garbled_{num_garbled}.messages"
+    combined_file = out_dir / f"{version}_realistic_{total}.messages"
+
+    with (
+        correct_file.open("w", encoding="utf-8", buffering=OUTPUT_BUFFER_SIZE) as correct_out,
+        semantic_file.open("w", encoding="utf-8", buffering=OUTPUT_BUFFER_SIZE) as semantic_out,
+        garbled_file.open("w", encoding="utf-8", buffering=OUTPUT_BUFFER_SIZE) as garbled_out,
+        combined_file.open("w", encoding="utf-8", buffering=OUTPUT_BUFFER_SIZE) as combined_out,
+    ):
+        generate_for_version(
+            version,
+            templates,
+            num_correct,
+            num_semantic_incorrect,
+            num_garbled,
+            ref,
+            model,
+            correct_out,
+            semantic_out,
+            garbled_out,
+            combined_out,
+        )
+
+    return version, correct_file, semantic_file, garbled_file, combined_file, total
 
 
 def main() -> int:
@@ -775,6 +1169,14 @@ def main() -> int:
     parser.add_argument("--num-correct", "--num_correct", dest="num_correct", type=int, default=850)
     parser.add_argument("--num-semantic-incorrect", "--num_semantic_incorrect", dest="num_semantic_incorrect", type=int, default=100)
     parser.add_argument("--num-garbled", "--num_garbled", dest="num_garbled", type=int, default=50)
+    parser.add_argument(
+        "--refresh-reference",
+        "--refresh_reference",
+        "--refresh",
+        dest="refresh_reference",
+        action="store_true",
+        help="download reference data even if today's cached copy exists",
+    )
     args = parser.parse_args()
 
     if args.num_correct < 0 or args.num_semantic_incorrect < 0 or args.num_garbled < 0:
@@ -793,48 +1195,35 @@ def main() -> int:
 
     ref_path = reference_dir / "realistic_reference_data.json"
     try:
-        ref = load_reference_data()
+        ref = load_reference_data(reference_dir, refresh=args.refresh_reference)
     except Exception as exc:
         warn(f"Live reference data generation failed: {exc}")
         if ref_path.exists():
             warn(f"Using cached reference data from {ref_path}")
-            ref = json.loads(ref_path.read_text(encoding="utf-8"))
+            ref = json_loads(ref_path.read_bytes())
         else:
             warn("Using built-in fallback reference data")
             ref = default_reference_data()
 
     ref["generated_at"] = datetime.now(UTC).strftime("%Y-%m-%dT%H:%M:%SZ")
-    ref_path.write_text(json.dumps(ref, indent=2), encoding="utf-8")
+    ref_path.write_bytes(json_dumps_indented(ref))
 
-    generated = []
+    jobs = []
     for version, templates in sorted(base.items()):
         dict_path = dict_dir / f"{version}.xml"
         if not dict_path.exists():
             print(f"Skipping {version}: missing dictionary {dict_path}")
             continue
-        model = load_dictionary_model(dict_path)
-        correct, semantic_bad, garbled = generate_for_version(
-            version,
-            templates,
-            args.num_correct,
-            args.num_semantic_incorrect,
-            args.num_garbled,
-            ref,
-            model,
+        jobs.append(
+            (version, templates, dict_path, out_dir, args.num_correct, args.num_semantic_incorrect, args.num_garbled, ref)
         )
 
-        total = len(correct) + len(semantic_bad) + len(garbled)
-        correct_file = out_dir / f"{version}_realistic_correct_{len(correct)}.messages"
-        semantic_file = out_dir / f"{version}_realistic_semantic_incorrect_{len(semantic_bad)}.messages"
-        garbled_file = out_dir / f"{version}_realistic_garbled_{len(garbled)}.messages"
-        combined_file = out_dir / f"{version}_realistic_{total}.messages"
-
-        correct_file.write_text("\n".join(correct) + ("\n" if correct else ""), encoding="utf-8")
-        semantic_file.write_text("\n".join(semantic_bad) + ("\n" if semantic_bad else ""), encoding="utf-8")
-        garbled_file.write_text("\n".join(garbled) + ("\n" if garbled else ""), encoding="utf-8")
-        combined_file.write_text("\n".join(correct + semantic_bad + garbled) + ("\n" if total else ""), encoding="utf-8")
-
-        generated.append((version, correct_file, semantic_file, garbled_file, combined_file, total))
+    # Versions are independent and generation is CPU bound, so use one process per version unless the run is tiny.
+    if len(jobs) > 1 and args.num_correct >= PARALLEL_MIN_MESSAGES:
+        with ProcessPoolExecutor(max_workers=min(len(jobs), os.cpu_count() or 1)) as pool:
+            generated = list(pool.map(write_version_files, *zip(*jobs)))
+    else:
+        generated = [write_version_files(*job) for job in jobs]
 
     print(f"Wrote reference data: {ref_path}")
     for version, correct_file, semantic_file, garbled_file, combined_file, total in generated:
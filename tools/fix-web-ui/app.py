@@ -1,11 +1,18 @@
 #!/usr/bin/env python3
+import functools
 import json
 import os
 import subprocess
+import threading
 from pathlib import Path
 
 from flask import Flask, render_template, request
 
+try:
+    import orjson
+except ImportError:  # optional accelerator, the standard library json module is used without it
+    orjson = None
+
 APP_DIR = Path(__file__).resolve().parent
 PARSER_BIN = APP_DIR / "bin" / "fix_web_parser"
 DICT_DIR = Path(os.getenv("FIX_DICT_DIR", "/app/data/quickfix"))
@@ -13,45 +20,75 @@ PORT = int(os.getenv("PORT", "8081"))
 
 app = Flask(__name__)
 
+_worker: subprocess.Popen | None = None
+_worker_lock = threading.Lock()
+
+
+class ParserError(Exception):
+    pass
+
+
+def failure(parse_error: str) -> dict:
+    return {
+        "ok": False,
+        "parse_error": parse_error,
+        "fields": [],
+        "validation_errors": [],
+        "begin_string": "",
+        "msg_type": "",
+        "structurally_valid": False,
+    }
+
+
+def parser_worker(dict_dir: str) -> subprocess.Popen:
+    """Return the long-lived parser process, starting it on first use so dictionaries load only once."""
+    global _worker
+    if _worker is None or _worker.poll() is not None:
+        _worker = subprocess.Popen([str(PARSER_BIN), dict_dir], stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+    return _worker
+
+
+def stop_worker() -> None:
+    global _worker
+    if _worker is not None:
+        _worker.kill()
+        _worker.wait()
+        _worker = None
+
+
+@functools.lru_cache(maxsize=1024)
+def parse_raw(dict_dir: str, message: str) -> bytes:
+    """Return the parser's JSON reply for one message; failures raise so they are never cached."""
+    data = message.encode("utf-8")
+    with _worker_lock:
+        try:
+            proc = parser_worker(dict_dir)
+            proc.stdin.write(str(len(data)).encode("ascii") + b"\n" + data)
+            proc.stdin.flush()
+            line = proc.stdout.readline()
+        except OSError as exc:
+            stop_worker()
+            raise ParserError(str(exc)) from exc
+        if not line:
+            stop_worker()
+            raise ParserError("worker exited unexpectedly")
+    return line
+
 
 def parse_message(message: str) -> dict:
     if not PARSER_BIN.exists():
-        return {
-            "ok": False,
-            "parse_error": f"Parser binary not found: {PARSER_BIN}",
-            "fields": [],
-            "validation_errors": [],
-            "begin_string": "",
-            "msg_type": "",
-            "structurally_valid": False,
-        }
-
-    cmd = [str(PARSER_BIN), str(DICT_DIR), message]
-    proc = subprocess.run(cmd, capture_output=True, text=True)
-
-    if proc.returncode != 0:
-        return {
-            "ok": False,
-            "parse_error": f"Parser execution failed: {proc.stderr.strip() or proc.stdout.strip()}",
-            "fields": [],
-            "validation_errors": [],
-            "begin_string": "",
-            "msg_type": "",
-            "structurally_valid": False,
-        }
+        return failure(f"Parser binary not found: {PARSER_BIN}")
 
     try:
-        return json.loads(proc.stdout)
+        line = parse_raw(str(DICT_DIR), message)
+    except ParserError as exc:
+        return failure(f"Parser execution failed: {exc}")
+
+    try:
+        # orjson.JSONDecodeError subclasses json.JSONDecodeError, so one handler covers both decoders.
+        return orjson.loads(line) if orjson is not None else json.loads(line)
     except json.JSONDecodeError as exc:
-        return {
-            "ok": False,
-            "parse_error": f"Parser returned invalid JSON: {exc}",
-            "fields": [],
-            "validation_errors": [],
-            "begin_string": "",
-            "msg_type": "",
-            "structurally_valid": False,
-        }
+        return failure(f"Parser returned invalid JSON: {exc}")
 
 
 @app.get("/")
@@ -67,5 +104,15 @@ def parse():
     return render_template("index.html", message=message, result=result)
 
 
+@app.post("/reload")
+def reload():
+    """Forget cached results and restart the parser so dictionary changes on disk are picked up."""
+    parse_raw.cache_clear()
+    with _worker_lock:
+        stop_worker()
+    return {"reloaded": True}
+
+
 if __name__ == "__main__":
+    # Development server only; the container runs gunicorn with gunicorn.conf.py.
     app.run(host="0.0.0.0", port=PORT)
@@ -166,19 +166,9 @@ std::string typedValueToString(const fix::DecodedField &field)
     return "<untyped>";
 }
 
-}  // namespace
-
-int main(int argc, char **argv)
+std::string decodeToJson(const fix::Decoder &decoder, const std::string &raw)
 {
-    if(argc < 3)
-    {
-        std::cerr << "Usage: fix_web_parser <dict_dir> <message>\n";
-        return 2;
-    }
-
-    const std::string dict_dir = argv[1];
-    const std::string raw      = argv[2];
-    const std::string norm     = normalize(raw);
+    const std::string norm = normalize(raw);
 
     std::vector<Token> tokens;
     std::string        parse_error;
@@ -191,10 +181,6 @@ int main(int argc, char **argv)
         partial_message.push_back(static_cast<char>(0x01));
     }
 
-    fix::Decoder decoder;
-    std::string  load_error;
-    decoder.loadDictionariesFromDirectory(dict_dir, &load_error);
-
     const fix::DecodedMessage decoded = decoder.decode(partial_message);
 
     bool has_begin = false;
@@ -264,6 +250,57 @@ int main(int argc, char **argv)
     json << "]";
 
     json << "}";
-    std::cout << json.str();
+    return json.str();
+}
+
+/**
+ * Worker mode: each request on stdin is a line holding the message length in bytes, followed by exactly that
+ * many bytes of message. Each response is one line of JSON on stdout. Messages may therefore contain newlines.
+ */
+int serve(const fix::Decoder &decoder)
+{
+    std::string header;
+    while(std::getline(std::cin, header))
+    {
+        std::size_t size = 0;
+        const auto [ptr, ec] = std::from_chars(header.data(), header.data() + header.size(), size);
+        if(ec != std::errc{} || ptr != header.data() + header.size())
+        {
+            std::cerr << "fix_web_parser: invalid request header: " << header << "\n";
+            return 2;
+        }
+
+        std::string raw(size, '\0');
+        if(!std::cin.read(raw.data(), static_cast<std::streamsize>(size)))
+        {
+            std::cerr << "fix_web_parser: truncated request\n";
+            return 2;
+        }
+
+        std::cout << decodeToJson(decoder, raw) << std::endl;
+    }
+    return 0;
+}
+
+}  // namespace
+
+int main(int argc, char **argv)
+{
+    if(argc < 2)
+    {
+        std::cerr << "Usage: fix_web_parser <dict_dir> [<message>]\n";
+        return 2;
+    }
+
+    fix::Decoder decoder;
+    std::string  load_error;
+    decoder.loadDictionariesFromDirectory(argv[1], &load_error);
+
+    if(argc < 3)
+    {
+        return serve(decoder);
+    }
+
+    std::cout << decodeToJson(decoder, argv[2]);
     return 0;
 }
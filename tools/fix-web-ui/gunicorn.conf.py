@@ -0,0 +1,8 @@
+import os
+
+# gthread workers honour keep-alive; the default sync workers close the connection after every response.
+bind = f"0.0.0.0:{os.getenv('PORT', '8081')}"
+workers = int(os.getenv("WEB_WORKERS", "2"))
+worker_class = "gthread"
+threads = int(os.getenv("WEB_THREADS", "4"))
+keepalive = 15